@@ -7,39 +7,285 @@ Developed by Aditya @xdityagr, 2025
 import sys
 import os
 import random
+import hashlib
+import collections
+import functools
+import re
+import mmap
+import struct
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from bot_utils import BotController
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-class ImageLoaderSignals(QObject):
-    loaded = Signal(QPixmap)
+THUMB_SIZE = 512
+DISPLAY_SIZE = 400
+THUMB_CACHE_SIZE = 32
+LOAD_BATCH_SIZE = 32
+EAGER_LOAD_LIMIT = 200
+THUMB_DISK_LIMIT = 512 * 1024 * 1024
+PACK_GUI_DECODES = 2
+THUMB_FORMAT = QImage.Format_ARGB32_Premultiplied
 
-class ImageLoader(QRunnable):
-    def __init__(self, path):
-        super().__init__()
-        self.path = path
-        self.signals = ImageLoaderSignals()
+# Per-folder thumbnail pack: header, then (key length, offset, length) + key per entry, then PNG data
+PACK_MAGIC = b"DCTP"
+PACK_HEADER = struct.Struct("<4sdI")
+PACK_ENTRY = struct.Struct("<HQI")
+
+def thumb_key(path):
+    # Absolute path + mtime + target size, so edited images are re-decoded
+    return f"{path}:{os.path.getmtime(path)}:{THUMB_SIZE}x{THUMB_SIZE}"
+
+def thumb_cache_dir():
+    # Resolved in the GUI process, worker processes have no application name
+    cache_dir = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "dcaud_thumbs")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def thumb_cache_file(cache_dir, key):
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+def load_thumb(path, cache_dir):
+    # QImage is safe to use off the GUI thread, QPixmap is not
+    cache_file = thumb_cache_file(cache_dir, thumb_key(path))
+    image = QImage()
+    if not image.load(cache_file):
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        
+        # Let the decoder produce the thumbnail directly (DCT scaling for JPEG)
+        # instead of decoding at full resolution and resampling afterwards
+        size = reader.size()
+        if size.isValid() and (size.width() > THUMB_SIZE or size.height() > THUMB_SIZE):
+            reader.setScaledSize(size.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return image
+        # Fallback for formats that cannot report their size up front, the displayed
+        # thumbnail gets a smooth pass later. Images that already fit are kept as is
+        if image.width() > THUMB_SIZE or image.height() > THUMB_SIZE:
+            image = image.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio, Qt.FastTransformation)
+        # Other processes may be reading this file, so never expose a partial write. Failing
+        # to cache (e.g. the destination is open elsewhere on Windows) still returns the image
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            saved = image.save(tmp_file, "PNG")
+            if saved:
+                os.replace(tmp_file, cache_file)
+        except OSError:
+            saved = False
+        if not saved:
+            remove_quietly(tmp_file)
+    return image
+
+def decode_thumbs(paths, cache_dir):
+    # Runs in a worker process, raw pixel buffers are cheaper to ship back than re-encoded files.
+    # Paths that fail come back as (path, None) so the GUI can stop waiting on them
+    return [thumb_result(path, try_load_thumb(path, cache_dir)) for path in paths]
+
+def decode_packed_thumbs(pack_file, entries, cache_dir):
+    # Runs in a worker process, decodes (path, offset, length) slices of a folder's pack. Falls
+    # back to the source if the pack was replaced or removed after the GUI mapped it
+    data = {}
+    try:
+        with open(pack_file, "rb") as f:
+            for path, offset, length in entries:
+                f.seek(offset)
+                data[path] = f.read(length)
+    except OSError:
+        pass
+    
+    thumbs = []
+    for path, _, _ in entries:
+        image = QImage.fromData(data[path]) if path in data else QImage()
+        if image.isNull():
+            image = try_load_thumb(path, cache_dir)
+        thumbs.append(thumb_result(path, image))
+    return thumbs
+
+def try_load_thumb(path, cache_dir):
+    try:
+        return load_thumb(path, cache_dir)
+    except OSError:  # Deleted or renamed since the folder was scanned
+        return QImage()
+
+def thumb_result(path, image):
+    if image.isNull():
+        return (path, None)
+    image = image.convertToFormat(THUMB_FORMAT)
+    return (path, (image.width(), image.height(), image.bytesPerLine(), bytes(image.constBits())))
+
+def thumbs_to_images(thumbs):
+    # copy() detaches each QImage from the pickled buffer it wraps
+    images = []
+    for path, pixels in thumbs:
+        if pixels is not None:
+            width, height, bytes_per_line, data = pixels
+            images.append((path, QImage(data, width, height, bytes_per_line, THUMB_FORMAT).copy()))
+        else:
+            images.append((path, None))
+    return images
+
+def cache_thumbs(paths, cache_dir):
+    # Runs in a worker process, fills the per-file cache without shipping pixels back
+    for path in paths:
+        try:
+            if not os.path.exists(thumb_cache_file(cache_dir, thumb_key(path))):
+                load_thumb(path, cache_dir)
+        except OSError:
+            continue
+
+def thumb_pack_file(cache_dir, folder):
+    return os.path.join(cache_dir, hashlib.sha1(folder.encode("utf-8")).hexdigest() + ".thumbs")
 
-    def run(self):
-        pixmap = QPixmap(self.path)
-        if not pixmap.isNull():
-            self.signals.loaded.emit(pixmap)
+def pack_thumbs(folder, paths, cache_dir):
+    # Runs in a worker process, bakes the per-file cached thumbnails of a folder into one file.
+    # Nothing is decoded here, paths missing from the per-file cache are left out
+    folder_mtime = os.path.getmtime(folder)
+    entries = []
+    for path in paths:
+        try:
+            key = thumb_key(path)
+            cache_file = thumb_cache_file(cache_dir, key)
+            # Read once so the offset table always matches the bytes written below
+            with open(cache_file, "rb") as thumb:
+                entries.append((key.encode("utf-8"), thumb.read(), cache_file))
+        except OSError:
+            continue
+    
+    pack_file = thumb_pack_file(cache_dir, folder)
+    offset = PACK_HEADER.size + sum(PACK_ENTRY.size + len(key) for key, _, _ in entries)
+    tmp_file = f"{pack_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(PACK_HEADER.pack(PACK_MAGIC, folder_mtime, len(entries)))
+            for key, data, _ in entries:
+                f.write(PACK_ENTRY.pack(len(key), offset, len(data)))
+                f.write(key)
+                offset += len(data)
+            for _, data, _ in entries:
+                f.write(data)
+        os.replace(tmp_file, pack_file)
+    except OSError:
+        remove_quietly(tmp_file)
+        raise
+    
+    # The pack now holds these thumbnails, keeping the per-file copies would double disk use
+    for _, _, cache_file in entries:
+        remove_quietly(cache_file)
+    return folder
+
+def prune_thumb_cache(cache_dir, keep):
+    # Runs in a worker process, drops the oldest thumbnails and packs once the cache is over budget
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.path != keep and entry.name.endswith((".png", ".thumbs")) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= THUMB_DISK_LIMIT:
+            break
+        remove_quietly(path)
+        total -= size
+
+def discard_thumb_pack(pack_file, pack_stat):
+    # Only if a worker has not replaced it with a fresh pack in the meantime
+    try:
+        if os.path.samestat(pack_stat, os.stat(pack_file)):
+            remove_quietly(pack_file)
+    except OSError:
+        pass
+
+def read_thumb_pack(cache_dir, folder):
+    # Returns (mmap, {key: (offset, length)}), or None if the pack is missing or the folder changed since.
+    # Stale or corrupt packs are deleted so they do not linger in the cache
+    pack_file = thumb_pack_file(cache_dir, folder)
+    try:
+        with open(pack_file, "rb") as f:
+            pack_stat = os.fstat(f.fileno())
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        magic, folder_mtime, count = PACK_HEADER.unpack_from(buf, 0)
+        if magic != PACK_MAGIC or folder_mtime != os.path.getmtime(folder):
+            buf.close()
+            discard_thumb_pack(pack_file, pack_stat)
+            return None
+        
+        index = {}
+        pos = PACK_HEADER.size
+        for _ in range(count):
+            key_len, offset, length = PACK_ENTRY.unpack_from(buf, pos)
+            pos += PACK_ENTRY.size
+            index[buf[pos:pos + key_len].decode("utf-8")] = (offset, length)
+            pos += key_len
+    except (struct.error, UnicodeDecodeError):
+        buf.close()
+        discard_thumb_pack(pack_file, pack_stat)
+        return None
+    except OSError:  # Folder removed
+        buf.close()
+        return None
+    return buf, index
+
+class ImageLoaderSignals(QObject):
+    loaded = Signal(int, list)
+    packed = Signal(str)
+    prepared = Signal(int)
 
 class BotControllerGUI(QMainWindow):
+    # Status triggers matched in a single pass, group 1: logged in, group 2: started
+    _TRIGGER_RE = re.compile(r"(Logged in as DCAudioDetection#5665)|(Bot started)")
+    _WINDOW_ICON = None
+
     def __init__(self):
         super().__init__()
         self.bot_controller = BotController()
-        self.bot_controller.signals.speaking_update.connect(self.on_speaking_update, Qt.QueuedConnection)
+        # Direct call when emitted from the GUI thread, queued only when crossing threads
+        self.bot_controller.signals.speaking_update.connect(self.on_speaking_update, Qt.AutoConnection)
         self.bot_controller.signals.log_message.connect(self.on_log_message, Qt.QueuedConnection)
         self.bot_controller.signals.status_changed.connect(self.on_status_changed, Qt.QueuedConnection)
         
-        self.image_pool = QThreadPool()
-        self.image_pool.setMaxThreadCount(4)
-        self.pixmaps = []
+        self.image_pool = self.create_image_pool()
+        self.pool_generation = 0
+        self.image_futures = []
+        self.image_signals = ImageLoaderSignals(self)
+        self.image_signals.loaded.connect(self.on_images_loaded, Qt.QueuedConnection)
+        self.image_signals.packed.connect(self.on_thumbs_packed, Qt.QueuedConnection)
+        self.image_signals.prepared.connect(self.on_pack_step_prepared, Qt.QueuedConnection)
+        QPixmapCache.setCacheLimit(64 * 1024)
+        self.thumb_cache_dir = thumb_cache_dir()
+        self.thumb_cache = collections.OrderedDict()
+        self.pending_thumbs = set()
+        self.thumb_pack = None
+        self.thumb_pack_index = {}
+        self.pack_generation = 0
+        self.pack_pending = 0
+        self.image_paths = []
+        self.image_index = 0
+        self.display_path = None
+        self.lazy_load = False
         self.image_folder = ""
         self.current_status = "Stopped"
+        self.log_buffer = collections.deque(maxlen=10000)
         
         self.init_ui()
 
@@ -54,7 +300,10 @@ class BotControllerGUI(QMainWindow):
         config_group = QGroupBox("Configuration")
         config_layout = QFormLayout()
 
-        self.setWindowIcon(QIcon('window_icon.png'))
+        # Loaded once and shared, resolved next to this file rather than the working directory
+        if BotControllerGUI._WINDOW_ICON is None:
+            BotControllerGUI._WINDOW_ICON = QIcon(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'window_icon.png'))
+        self.setWindowIcon(BotControllerGUI._WINDOW_ICON)
         
         self.username_input = QLineEdit("")
         self.username_input.setPlaceholderText("Discord username to monitor")
@@ -119,12 +368,19 @@ class BotControllerGUI(QMainWindow):
         # Log tab
         log_group = QGroupBox("Bot Log")
         log_layout = QVBoxLayout()
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(5000)
         log_layout.addWidget(self.log_text)
         log_group.setLayout(log_layout)
         tabs.addTab(log_group, "Log")
         
+        # Coalesce bot output into one append per tick, armed only while lines are pending
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(50)
+        self.log_flush_timer.timeout.connect(self.flush_log)
+        
         main_layout.addWidget(tabs)
         
         # Set central widget
@@ -139,26 +395,200 @@ class BotControllerGUI(QMainWindow):
             self.folder_input.setText(folder)
             self.load_images()
 
+    def create_image_pool(self):
+        # Decode in separate processes so it never contends for the GIL with the GUI. Workers
+        # are spawned, forking a running multithreaded Qt process can deadlock the child
+        return ProcessPoolExecutor(max_workers=max(2, QThread.idealThreadCount() - 1),
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def submit_image_job(self, fn, *args):
+        try:
+            return self.image_pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died and took the pool with it. Start a fresh one and forget the work
+            # that was in flight, its results are dropped by the generation check
+            self.image_pool.shutdown(wait=False, cancel_futures=True)
+            self.image_pool = self.create_image_pool()
+            self.pool_generation += 1
+            self.pending_thumbs.clear()
+            self.image_futures.clear()
+            return self.image_pool.submit(fn, *args)
+
     def load_images(self):
-        self.pixmaps.clear()
+        self.thumb_cache.clear()
+        self.pending_thumbs.clear()
+        self.image_paths = []
+        self.image_index = 0
+        self.display_path = None
+        for future in self.image_futures:
+            future.cancel()
+        self.image_futures.clear()
+        self.pack_generation += 1
+        self.close_thumb_pack()
         if not self.image_folder:
             return
             
-        dir = QDir(self.image_folder)
+        # Only the paths are collected here, thumbnails are decoded when first shown
         filters = ["*.png", "*.jpg", "*.jpeg", "*.bmp"]
-        dir.setNameFilters(filters)
-        image_files = dir.entryList()
+        it = QDirIterator(self.image_folder, filters, QDir.Files)
+        while it.hasNext():
+            self.image_paths.append(it.next())
+        
+        # Keep the on-disk cache bounded, never touching the pack this folder is about to use
+        self.submit_image_job(prune_thumb_cache, self.thumb_cache_dir, thumb_pack_file(self.thumb_cache_dir, self.image_folder))
+        
+        # Large folders skip all up-front decoding and rely on the LRU alone
+        self.lazy_load = len(self.image_paths) > EAGER_LOAD_LIMIT
+        
+        self.open_thumb_pack()
+        
+        # Shuffle once per folder so picking the next image needs no RNG call
+        random.shuffle(self.image_paths)
+        if not self.image_paths:
+            return
+        preload = 1 if self.lazy_load else THUMB_CACHE_SIZE
+        futures = self.request_thumbs(self.image_paths[:preload])
         
-        for image_file in image_files:
-            loader = ImageLoader(os.path.join(self.image_folder, image_file))
-            loader.signals.loaded.connect(self.on_image_loaded)
-            self.image_pool.start(loader)
+        # Without a current pack, small folders get one baked once every thumbnail is in the
+        # per-file cache. The preload batches cover their own paths, the rest is cached in
+        # batches that stay cancellable
+        if self.thumb_pack is None and not self.lazy_load:
+            rest = self.image_paths[preload:]
+            for i in range(0, len(rest), LOAD_BATCH_SIZE):
+                future = self.submit_image_job(cache_thumbs, rest[i:i + LOAD_BATCH_SIZE], self.thumb_cache_dir)
+                self.image_futures.append(future)
+                futures.append(future)
+            
+            self.pack_pending = len(futures)
+            for future in futures:
+                future.add_done_callback(functools.partial(self.on_pack_step_done, self.pack_generation))
+            if not futures:
+                self.start_thumb_pack()
+
+    def open_thumb_pack(self):
+        pack = read_thumb_pack(self.thumb_cache_dir, self.image_folder)
+        if pack is None:
+            return False
+        self.thumb_pack, self.thumb_pack_index = pack
+        return True
+
+    def close_thumb_pack(self):
+        if self.thumb_pack is not None:
+            self.thumb_pack.close()
+        self.thumb_pack = None
+        self.thumb_pack_index = {}
+
+    def packed_thumb_entry(self, path):
+        if not self.thumb_pack_index:
+            return None
+        try:
+            return self.thumb_pack_index.get(thumb_key(path))
+        except OSError:
+            return None
+
+    def request_thumbs(self, paths):
+        missing = []
+        packed = []
+        inline_decodes = 0
+        for path in dict.fromkeys(paths):
+            if path in self.thumb_cache or path in self.pending_thumbs:
+                continue
+            entry = self.packed_thumb_entry(path)
+            if entry is None:
+                missing.append(path)
+                continue
+            
+            offset, length = entry
+            if inline_decodes >= PACK_GUI_DECODES:
+                packed.append((path, offset, length))
+                continue
+            
+            # The first picks are needed right away and are cheap enough to decode here
+            inline_decodes += 1
+            image = QImage.fromData(self.thumb_pack[offset:offset + length])
+            if image.isNull():
+                missing.append(path)
+            else:
+                self.add_thumb(path, image)
+        
+        # Everything else decodes in the pool, keeping the GUI thread free during folder selection
+        pack_file = thumb_pack_file(self.thumb_cache_dir, self.image_folder)
+        futures = []
+        for i in range(0, len(packed), LOAD_BATCH_SIZE):
+            batch = packed[i:i + LOAD_BATCH_SIZE]
+            futures.append(self.submit_thumb_batch([path for path, _, _ in batch],
+                                                   decode_packed_thumbs, pack_file, batch, self.thumb_cache_dir))
+        for i in range(0, len(missing), LOAD_BATCH_SIZE):
+            batch = missing[i:i + LOAD_BATCH_SIZE]
+            futures.append(self.submit_thumb_batch(batch, decode_thumbs, batch, self.thumb_cache_dir))
+        self.image_futures = [future for future in self.image_futures if not future.done()]
+        return futures
+
+    def submit_thumb_batch(self, paths, fn, *args):
+        # Mark pending only after submitting, a pool rebuild clears pending_thumbs
+        future = self.submit_image_job(fn, *args)
+        self.pending_thumbs.update(paths)
+        future.add_done_callback(functools.partial(self.on_decode_done, self.pool_generation, paths))
+        self.image_futures.append(future)
+        return future
+
+    def on_decode_done(self, generation, paths, future):
+        # Called on the executor's thread, the queued signal hands the images to the GUI thread
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # Report the whole batch as failed so its paths can be requested again
+            self.image_signals.loaded.emit(generation, [(path, None) for path in paths])
+            return
+        self.image_signals.loaded.emit(generation, thumbs_to_images(future.result()))
+
+    def on_pack_step_done(self, generation, future):
+        # A failed step leaves the folder without a pack rather than baking a partial one
+        if not future.cancelled() and future.exception() is None:
+            self.image_signals.prepared.emit(generation)
+
+    @Slot(int)
+    def on_pack_step_prepared(self, generation):
+        if generation != self.pack_generation:
+            return  # Left over from a previous folder
+        self.pack_pending -= 1
+        if self.pack_pending == 0:
+            self.start_thumb_pack()
+
+    def start_thumb_pack(self):
+        future = self.submit_image_job(pack_thumbs, self.image_folder, list(self.image_paths), self.thumb_cache_dir)
+        future.add_done_callback(self.on_pack_done)
+        self.image_futures.append(future)
 
-    @Slot(QPixmap)
-    def on_image_loaded(self, pixmap):
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(400, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.pixmaps.append(scaled_pixmap)
+    def on_pack_done(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.image_signals.packed.emit(future.result())
+
+    @Slot(str)
+    def on_thumbs_packed(self, folder):
+        if folder == self.image_folder and self.thumb_pack is None:
+            self.open_thumb_pack()
+
+    @Slot(int, list)
+    def on_images_loaded(self, generation, images):
+        if generation != self.pool_generation:
+            return  # From a pool that has since been replaced
+        for path, image in images:
+            if path not in self.pending_thumbs:
+                continue  # Left over from a previous folder
+            self.pending_thumbs.discard(path)
+            if image is not None:
+                self.add_thumb(path, image)
+
+    def add_thumb(self, path, image):
+        self.thumb_cache[path] = image
+        if path == self.display_path:
+            self.image_label.setPixmap(self.thumb_pixmap(image))
+        
+        # Evict least recently used thumbnails
+        while len(self.thumb_cache) > THUMB_CACHE_SIZE:
+            self.thumb_cache.popitem(last=False)
 
     def start_bot(self):
         username = self.username_input.text().strip()
@@ -189,6 +619,8 @@ class BotControllerGUI(QMainWindow):
         self.current_status = "Stopped"
         
     def clear_log(self):
+        self.log_flush_timer.stop()
+        self.log_buffer.clear()
         self.log_text.clear()
         
     @Slot(dict)
@@ -201,26 +633,62 @@ class BotControllerGUI(QMainWindow):
         
         if speaking:
             self.speaking_status.setStyleSheet("color: green; font-weight: bold;")
-            if self.pixmaps:
-                self.image_label.setPixmap(random.choice(self.pixmaps))
+            if self.image_paths:
+                self.show_next_image()
         else:
             self.speaking_status.setStyleSheet("color: black; font-weight: normal;")
             
+    def show_next_image(self):
+        path = self.image_paths[self.image_index]
+        self.image_index = (self.image_index + 1) % len(self.image_paths)
+        self.display_path = path
+        
+        image = self.thumb_cache.get(path)
+        if image is not None:
+            self.thumb_cache.move_to_end(path)
+            self.image_label.setPixmap(self.thumb_pixmap(image))
+        
+        # Misses are shown by on_images_loaded, prefetch the next pick either way
+        self.request_thumbs([path, self.image_paths[self.image_index]])
+
+    def thumb_pixmap(self, image):
+        # Only the displayed thumbnail is smooth scaled and converted, reuse it while cached
+        key = f"thumb:{image.cacheKey()}"
+        pixmap = QPixmap()
+        if not QPixmapCache.find(key, pixmap):
+            target = image.size().scaled(DISPLAY_SIZE, DISPLAY_SIZE, Qt.KeepAspectRatio)
+            if target != image.size():
+                image = image.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+
     @Slot(str)
     def on_log_message(self, message):
-        self.log_text.append(message)
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.log_text.setTextCursor(cursor)
+        if not self.log_buffer:
+            self.log_flush_timer.start()
+        self.log_buffer.append(message)
+        
+        match = self._TRIGGER_RE.search(message)
+        if match is None:
+            return
         
-        if "Logged in as DCAudioDetection#5665" in message:
+        if match.lastindex == 1:
             self.status_display.setText("You can join the bot on the server using !join now")
             self.current_status = "Running"
             
-        elif "Bot started" in message and self.current_status == "Starting":
+        elif self.current_status == "Starting":
             self.status_display.setText("Bot Running")
             self.current_status = "Running"
 
+    def flush_log(self):
+        if not self.log_buffer:
+            return
+        
+        messages = "\n".join(self.log_buffer)
+        self.log_buffer.clear()
+        self.log_text.appendPlainText(messages)
+
     @Slot(bool)
     def on_status_changed(self, running):
         if running:
@@ -240,8 +708,9 @@ class BotControllerGUI(QMainWindow):
 
     def closeEvent(self, event):
         self.bot_controller.cleanup()
-        self.image_pool.clear()
-        self.image_pool.waitForDone()
+        # Running batches finish on their own, cache and pack files are written atomically
+        self.image_pool.shutdown(wait=False, cancel_futures=True)
+        self.close_thumb_pack()
         event.accept()
 
 if __name__ == "__main__":